@@ -1,16 +1,41 @@
 # Part 1: Imports and Constants Setup
 import dash
-from dash import html, dcc, dash_table, Input, Output, State, callback_context
+from dash import html, dcc, dash_table, Input, Output, State, Patch, ctx, no_update
 from dash.dependencies import ALL, MATCH
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import base64
+import hashlib
 import io
+import json
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Any
 
+# Prefer the Rust-based calamine reader for Excel uploads when it is installed
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+# Likewise prefer pyarrow's multithreaded parser for CSV uploads
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# Numba is optional; it only speeds up priority classification on very large uploads
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Color scheme for better visual hierarchy
 COLORS = {
     'primary': '#1e40af',      # Deep blue
@@ -49,6 +74,9 @@ TASK_THRESHOLDS = {
     'Waiting for the maid to go to medical test(MV)': 72
 }
 
+# Threshold (in hours) used for tasks missing from TASK_THRESHOLDS
+DEFAULT_TASK_THRESHOLD = 24
+
 # Assignees list
 ASSIGNEES = [
     'Chekri Khalife',
@@ -61,6 +89,44 @@ ASSIGNEES = [
 ]
 
 
+# Columns an upload must contain to be processed
+REQUIRED_COLUMNS = ['Task', 'Real Delay (hours)']
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORY_COLUMNS = ['Task', 'Housemaid Nationality', 'Housemaid Type', 'Housemaid Status', 'Assignee']
+
+# Columns the summary charts are built from
+CHART_COLUMNS = ['Housemaid Type', 'Housemaid Status', 'Task']
+
+# Number of chart sets kept in memory for repeated filter selections
+CHART_CACHE_SIZE = 8
+
+# Columns offered as dashboard filters (task, nationality, status, type)
+FILTER_COLUMNS = ['Task', 'Housemaid Nationality', 'Housemaid Status', 'Housemaid Type']
+
+# Filter dropdown ids, in the same order as FILTER_COLUMNS
+FILTER_IDS = ['task-filter', 'nationality-filter', 'status-filter', 'type-filter']
+
+# Browser-side table filter over the stored delayed records, one selection per FILTER_COLUMNS entry
+FILTER_RECORDS_JS = '''
+function(records, ...selections) {
+    const columns = %s;
+    const active = columns
+        .map((column, i) => [column, selections[i]])
+        .filter(([column, selected]) => selected && selected.length);
+    if (!records || !active.length) {
+        return records || [];
+    }
+    return records.filter(row => active.every(([column, selected]) => selected.includes(row[column])));
+}
+''' % json.dumps(FILTER_COLUMNS)
+
+# Seconds that memoized callback results stay in the server-side cache
+CACHE_TIMEOUT = 300
+
+# Number of parsed uploads kept in memory for repeated uploads
+UPLOAD_CACHE_SIZE = 4
+
 # Priority levels with corresponding colors
 PRIORITY_LEVELS = {
     'High': COLORS['danger'],
@@ -68,6 +134,125 @@ PRIORITY_LEVELS = {
     'Low': COLORS['success']
 }
 
+# Priority labels indexed by priority code (0=Low, 1=Medium, 2=High)
+PRIORITY_LABELS = ['Low', 'Medium', 'High']
+
+# Row count above which priorities are classified with the Numba kernel (when installed)
+NUMBA_MIN_ROWS = 200_000
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def classify_priority(delay, threshold, out):
+        """Write the priority code of every row into out in a single parallel pass"""
+        for i in prange(delay.size):
+            d = delay[i]
+            t = threshold[i]
+            # Missing delays compare as False and fall through to Low
+            out[i] = 2 if d > t * 2 else (1 if d > t else 0)
+
+# Columns configuration for the DataTable
+DATATABLE_COLUMNS = [
+    {'name': 'Task', 'id': 'Task'},
+    {'name': 'Housemaid Name', 'id': 'Housemaid Name'},
+    {'name': 'Nationality', 'id': 'Housemaid Nationality'},
+    {'name': 'Type', 'id': 'Housemaid Type'},
+    {'name': 'Status', 'id': 'Housemaid Status'},
+    {
+        'name': 'Real Delay (hours)', 
+        'id': 'Real Delay (hours)',
+        'type': 'numeric',
+        'format': {'specifier': '.1f'}
+    },
+    {
+        'name': 'Threshold Hours', 
+        'id': 'Threshold Hours',
+        'type': 'numeric'
+    },
+    {'name': 'Duration in Task', 'id': 'Duration in The Task'},
+    {
+        'name': 'Assignee', 
+        'id': 'Assignee', 
+        'presentation': 'dropdown',
+        'editable': True
+    },
+    {
+        'name': 'Notes', 
+        'id': 'Notes', 
+        'presentation': 'markdown',
+        'editable': True
+    },
+    {'name': 'Last Updated', 'id': 'Last Updated'}
+]
+
+# Style conditions for the DataTable
+DATATABLE_STYLE_CONDITIONS = [
+    # Priority-based styling
+    {
+        'if': {
+            'column_id': 'Priority',
+            'filter_query': '{Priority} eq "High"'
+        },
+        'backgroundColor': 'rgba(220, 38, 38, 0.1)',
+        'color': COLORS['danger']
+    },
+    {
+        'if': {
+            'column_id': 'Priority',
+            'filter_query': '{Priority} eq "Medium"'
+        },
+        'backgroundColor': 'rgba(217, 119, 6, 0.1)',
+        'color': COLORS['warning']
+    },
+    {
+        'if': {
+            'column_id': 'Priority',
+            'filter_query': '{Priority} eq "Low"'
+        },
+        'backgroundColor': 'rgba(5, 150, 105, 0.1)',
+        'color': COLORS['success']
+    },
+    # Unassigned cases styling
+    {
+        'if': {
+            'column_id': 'Assignee',
+            'filter_query': '{Assignee} eq "Unassigned"'
+        },
+        'backgroundColor': 'rgba(239, 68, 68, 0.1)',
+        'color': COLORS['danger']
+    },
+    # Delay threshold styling
+    {
+        'if': {
+            'column_id': 'Real Delay (hours)',
+            'filter_query': f'{{Real Delay (hours)}} >= {{Threshold Hours}}'
+        },
+        'backgroundColor': 'rgba(220, 38, 38, 0.1)',
+        'color': COLORS['danger']
+    }
+]
+
+# Header style for the DataTable
+DATATABLE_STYLE_HEADER = {
+    'backgroundColor': COLORS['primary'],
+    'color': 'white',
+    'fontWeight': 'bold',
+    'textAlign': 'left',
+    'padding': '12px 15px',
+    'whiteSpace': 'normal',
+    'height': 'auto',
+}
+
+# Cell style for the DataTable
+DATATABLE_STYLE_CELL = {
+    'padding': '12px 15px',
+    'textAlign': 'left',
+    'fontFamily': 'system-ui',
+    'fontSize': '14px',
+    'color': COLORS['text'],
+    'whiteSpace': 'normal',
+    'height': 'auto',
+}
+
 class DelayedMaidsApp:
     def __init__(self):
         """Initialize the Dash application with configurations"""
@@ -83,86 +268,201 @@ class DelayedMaidsApp:
             title='Delayed Maids Dashboard',
             update_title=None
         )
+        self.cache = Cache(self.app.server, config={'CACHE_TYPE': 'SimpleCache'})
         
         # Initialize data storage
         self.current_data = pd.DataFrame()
+        self._data_version = 0  # Bumped whenever current_data changes
+        self._delayed_cache = pd.DataFrame()
+        self._delayed_cache_version = -1
+        self._last_upload_key = None
         self.task_thresholds = TASK_THRESHOLDS.copy()
+        self._threshold_series = pd.Series(self.task_thresholds, dtype=np.float64)
+        
+        # Threshold input grid is built once and reused by the layout
+        self._threshold_inputs = [
+            html.Div([
+                html.Label(
+                    task,
+                    className='text-sm font-medium text-gray-700 mb-1'
+                ),
+                dbc.Input(
+                    id={'type': 'threshold-input', 'task': task},
+                    type='number',
+                    value=hours,
+                    min=0,
+                    className='mb-2'
+                )
+            ]) for task, hours in self.task_thresholds.items()
+        ]
         self.last_update = datetime.now()
+        self._chart_cache: Dict[tuple, Dict[str, go.Figure]] = {}
+        self._upload_cache: OrderedDict = OrderedDict()
 
-    def calculate_priority(self, row: pd.Series) -> str:
-        """Calculate priority based on delay threshold"""
-        try:
-            delay = float(row['Real Delay (hours)'])
-            threshold = self.task_thresholds.get(row['Task'], 24)
-            
-            if delay > threshold * 2:
-                return 'High'
-            elif delay > threshold:
-                return 'Medium'
-            return 'Low'
-        except:
-            return 'Low'
+    def map_thresholds(self, tasks: pd.Series) -> pd.Series:
+        """Look up the delay threshold (in hours) for each task"""
+        if isinstance(tasks.dtype, pd.CategoricalDtype):
+            # Look each category up once, then gather by code; the trailing default
+            # is what code -1 (a missing task) picks up
+            by_code = self._threshold_series.reindex(tasks.cat.categories).fillna(DEFAULT_TASK_THRESHOLD)
+            by_code = np.append(by_code.to_numpy(dtype=np.float64), DEFAULT_TASK_THRESHOLD)
+            thresholds = pd.Series(by_code[tasks.cat.codes.to_numpy()], index=tasks.index)
+        else:
+            thresholds = tasks.map(self._threshold_series).astype(np.float64).fillna(DEFAULT_TASK_THRESHOLD)
+        return self.downcast_hours(thresholds)
 
-    def process_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process the uploaded data with proper task handling"""
-        try:
-            # Clean column names
-            df.columns = df.columns.str.strip()
-            
-            # Forward fill Task column (handle grouped tasks)
-            current_task = None
-            tasks = []
-            
-            for task in df['Task']:
-                if pd.notna(task) and str(task).strip():
-                    current_task = str(task).strip()
-                tasks.append(current_task)
-            
-            df['Task'] = tasks
-            
-            # Add required columns
-            df['Threshold Hours'] = df['Task'].map(self.task_thresholds)
-            
-            # Set default values for tracking columns
-            if 'Assignee' not in df.columns:
-                df['Assignee'] = 'Unassigned'
-            if 'Notes' not in df.columns:
-                df['Notes'] = ''
-            
-            df['Last Updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Convert date columns
-            date_columns = ['Task Move in Date', 'Work Permit Expiry Date']
-            for col in date_columns:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], format='%m/%d/%Y %I:%M:%S %p', errors='coerce')
-            
-            # Process numeric columns
-            if 'Real Delay (hours)' in df.columns:
-                df['Real Delay (hours)'] = pd.to_numeric(df['Real Delay (hours)'], errors='coerce')
-            
-            # Calculate delay status and priority
-            df['Is Delayed'] = df.apply(
-                lambda row: row['Real Delay (hours)'] > self.task_thresholds.get(row['Task'], 24) 
-                if pd.notna(row['Real Delay (hours)']) and pd.notna(row['Task']) 
-                else False,
-                axis=1
+    def downcast_hours(self, hours: pd.Series) -> pd.Series:
+        """Store hour values as float32 when that loses no precision"""
+        narrow = hours.astype(np.float32)
+        if np.array_equal(narrow.to_numpy(dtype=np.float64), hours.to_numpy(dtype=np.float64), equal_nan=True):
+            return narrow
+        return hours
+
+    def to_records(self, df: pd.DataFrame) -> List[Dict]:
+        """Convert a DataFrame to DataTable records one column at a time"""
+        # Series.tolist boxes each column to native Python values in one pass,
+        # which is noticeably cheaper than to_dict('records') boxing cell by cell
+        columns = list(df.columns)
+        values = (df.iloc[:, i].tolist() for i in range(len(columns)))
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    def count_values(self, series: pd.Series) -> pd.Series:
+        """Count occurrences of each value, leaving out unused categories"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Count the integer codes (-1 marks missing values), then label them with their categories
+            codes = series.cat.codes.to_numpy()
+            counts = pd.Series(
+                np.bincount(codes[codes >= 0], minlength=len(series.cat.categories)),
+                index=series.cat.categories
             )
+            return counts[counts > 0].sort_values(ascending=False, kind='stable')
+        
+        counts = series.value_counts()
+        return counts[counts > 0]
+
+    def calculate_delay_status(self, df: pd.DataFrame) -> np.ndarray:
+        """Flag rows whose delay exceeds their task threshold"""
+        delay = df['Real Delay (hours)'].to_numpy(dtype=np.float64, copy=False)
+        threshold = df['Threshold Hours'].to_numpy(dtype=np.float64, copy=False)
+        
+        # Missing delays compare as False; rows without a task are never delayed
+        return (delay > threshold) & df['Task'].notna().to_numpy()
+
+    def calculate_priority(self, df: pd.DataFrame) -> pd.Categorical:
+        """Calculate priority for every row based on delay threshold"""
+        delay = df['Real Delay (hours)'].to_numpy(dtype=np.float64, copy=False)
+        threshold = df['Threshold Hours'].to_numpy(dtype=np.float64, copy=False)
+        
+        if njit is not None and delay.size > NUMBA_MIN_ROWS:
+            codes = np.empty(delay.size, dtype=np.int8)
+            classify_priority(delay, threshold, codes)
+        else:
+            # Missing delays compare as False and fall through to Low
+            codes = np.select(
+                [delay > threshold * 2, delay > threshold],
+                [2, 1],
+                default=0
+            ).astype(np.int8)
+        
+        return pd.Categorical.from_codes(codes, categories=PRIORITY_LABELS)
+
+    def upload_key(self, contents: str, filename: str) -> bytes:
+        """Fingerprint an upload by its filename and base64 contents"""
+        return hashlib.blake2b(f"{filename.lower()}|{contents}".encode(), digest_size=16).digest()
+
+    def parse_upload(self, contents: str, filename: str, key: bytes = None) -> pd.DataFrame:
+        """Decode an uploaded file, reusing the parsed frame for repeated uploads"""
+        if key is None:
+            key = self.upload_key(contents, filename)
+        
+        if key in self._upload_cache:
+            self._upload_cache.move_to_end(key)
+        else:
+            content_type, content_string = contents.split(',')
+            decoded = base64.b64decode(content_string)
             
-            df['Priority'] = df.apply(self.calculate_priority, axis=1)
-            
-            return df
+            if filename.lower().endswith('.csv'):
+                df = pd.read_csv(io.BytesIO(decoded), encoding='utf-8', engine=CSV_ENGINE)
+            elif filename.lower().endswith(('.xls', '.xlsx')):
+                df = pd.read_excel(io.BytesIO(decoded), engine=EXCEL_ENGINE)
+            else:
+                raise ValueError("Unsupported file format")
             
-        except Exception as e:
-            print(f"Error processing data: {e}")
-            return pd.DataFrame()
+            self._upload_cache[key] = df
+            if len(self._upload_cache) > UPLOAD_CACHE_SIZE:
+                self._upload_cache.popitem(last=False)
+        
+        # Hand out a copy since process_data modifies the frame in place
+        return self._upload_cache[key].copy()
+
+    def process_data(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Process the uploaded data with proper task handling"""
+        # Clean column names
+        df.columns = df.columns.str.strip()
+        self._chart_cache.clear()
+        
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+        
+        # Forward fill Task column (handle grouped tasks), categorical so thresholds gather by code
+        tasks = df['Task'].astype('string').str.strip()
+        df['Task'] = tasks.replace('', pd.NA).ffill().astype('category')
+        
+        # Add required columns
+        df['Threshold Hours'] = self.map_thresholds(df['Task'])
+        
+        # Set default values for tracking columns
+        if 'Assignee' not in df.columns:
+            df['Assignee'] = 'Unassigned'
+        if 'Notes' not in df.columns:
+            df['Notes'] = ''
+        
+        # Every row shares the same timestamp, so store it as a single category
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        df['Last Updated'] = pd.Categorical.from_codes(
+            np.zeros(len(df), dtype=np.int8),
+            categories=[timestamp]
+        )
+        
+        # Convert date columns (parse each distinct timestamp only once)
+        date_columns = ['Task Move in Date', 'Work Permit Expiry Date']
+        for col in date_columns:
+            if col in df.columns:
+                try:
+                    codes, uniques = pd.factorize(df[col])
+                    parsed = pd.to_datetime(uniques, format='%m/%d/%Y %I:%M:%S %p', errors='coerce')
+                    df[col] = pd.Series(
+                        parsed.take(codes, allow_fill=True, fill_value=pd.NaT),
+                        index=df.index
+                    )
+                except (TypeError, ValueError) as e:
+                    # Keep the raw values rather than rejecting the whole upload
+                    print(f"Error parsing dates in '{col}': {e}")
+        
+        # Process numeric columns (unparseable values become NaN)
+        df['Real Delay (hours)'] = self.downcast_hours(
+            pd.to_numeric(df['Real Delay (hours)'], errors='coerce')
+        )
+        
+        # Calculate delay status and priority
+        df['Is Delayed'] = self.calculate_delay_status(df)
+        df['Priority'] = self.calculate_priority(df)
+        
+        # Store low-cardinality text columns as categoricals
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        return df
+
     def create_summary_charts(self, df: pd.DataFrame) -> Dict[str, go.Figure]:
         """Create improved summary charts for the dashboard"""
         charts = {}
         
         try:
-            # Only process delayed cases
-            delayed_df = df[df['Is Delayed']]
+            # Only process delayed cases, gathering just the charted columns
+            delayed_df = df.loc[df['Is Delayed'].to_numpy(dtype=bool), CHART_COLUMNS]
             
             if len(delayed_df) == 0:
                 # Return empty figures if no delayed cases
@@ -172,8 +472,19 @@ class DelayedMaidsApp:
                     'task': go.Figure()
                 }
             
+            # Reuse figures already built for the same delayed cases
+            cache_key = (
+                len(delayed_df),
+                int(pd.util.hash_pandas_object(delayed_df, index=False).sum())
+            )
+            if cache_key in self._chart_cache:
+                return self._chart_cache[cache_key]
+            
+            # Count each charted column in a single pass
+            counts = {col: self.count_values(delayed_df[col]) for col in CHART_COLUMNS}
+            
             # 1. Type Distribution (Pie Chart)
-            type_counts = delayed_df['Housemaid Type'].value_counts()
+            type_counts = counts['Housemaid Type']
             type_percentages = (type_counts / len(delayed_df) * 100).round(1)
             
             charts['type'] = px.pie(
@@ -190,7 +501,7 @@ class DelayedMaidsApp:
             )
             
             # 2. Status Distribution (Simplified Bar Chart)
-            status_data = delayed_df['Housemaid Status'].value_counts()
+            status_data = counts['Housemaid Status']
             status_df = pd.DataFrame({
                 'Status': status_data.index,
                 'Count': status_data.values,
@@ -202,7 +513,7 @@ class DelayedMaidsApp:
                     x=status_df['Count'],
                     y=status_df['Status'],
                     orientation='h',
-                    text=[f"{count} ({pct}%)" for count, pct in zip(status_df['Count'], status_df['Percentage'])],
+                    text=status_df['Count'].astype(str) + ' (' + status_df['Percentage'].astype(str) + '%)',
                     textposition='auto',
                     marker_color=COLORS['secondary']
                 )
@@ -217,7 +528,7 @@ class DelayedMaidsApp:
             )
             
             # 3. Task Distribution (Table format instead of graph)
-            task_data = delayed_df['Task'].value_counts()
+            task_data = counts['Task']
             task_df = pd.DataFrame({
                 'Task': task_data.index,
                 'Count': task_data.values,
@@ -236,7 +547,7 @@ class DelayedMaidsApp:
                         values=[
                             task_df['Task'],
                             task_df['Count'],
-                            task_df['Percentage'].apply(lambda x: f"{x}%")
+                            task_df['Percentage'].astype(str) + '%'
                         ],
                         align='left',
                         font=dict(size=11),
@@ -268,6 +579,10 @@ class DelayedMaidsApp:
                     margin=dict(t=50, l=10, r=10, b=10)
                 )
             
+            if len(self._chart_cache) >= CHART_CACHE_SIZE:
+                self._chart_cache.pop(next(iter(self._chart_cache)))
+            self._chart_cache[cache_key] = charts
+            
         except Exception as e:
             print(f"Error creating charts: {e}")
             charts = {
@@ -278,112 +593,15 @@ class DelayedMaidsApp:
         
         return charts
     
-    def create_datatable_columns(self):
-        """Create columns configuration for the DataTable"""
-        return [
-            {'name': 'Task', 'id': 'Task'},
-            {'name': 'Housemaid Name', 'id': 'Housemaid Name'},
-            {'name': 'Nationality', 'id': 'Housemaid Nationality'},
-            {'name': 'Type', 'id': 'Housemaid Type'},
-            {'name': 'Status', 'id': 'Housemaid Status'},
-            {
-                'name': 'Real Delay (hours)', 
-                'id': 'Real Delay (hours)',
-                'type': 'numeric',
-                'format': {'specifier': '.1f'}
-            },
-            {
-                'name': 'Threshold Hours', 
-                'id': 'Threshold Hours',
-                'type': 'numeric'
-            },
-            {'name': 'Duration in Task', 'id': 'Duration in The Task'},
-            {
-                'name': 'Assignee', 
-                'id': 'Assignee', 
-                'presentation': 'dropdown',
-                'editable': True
-            },
-            {
-                'name': 'Notes', 
-                'id': 'Notes', 
-                'presentation': 'markdown',
-                'editable': True
-            },
-            {'name': 'Last Updated', 'id': 'Last Updated'}
-        ]
+    def patch_figure(self, figure_json: Dict[str, Any]) -> Patch:
+        """Describe a chart update as a Patch that keeps the layout template already on the page"""
+        patched = Patch()
+        patched['data'] = figure_json['data']
+        for key, value in figure_json['layout'].items():
+            if key != 'template':
+                patched['layout'][key] = value
+        return patched
 
-    def create_datatable_style_conditions(self):
-        """Create style conditions for the DataTable"""
-        return [
-            # Priority-based styling
-            {
-                'if': {
-                    'column_id': 'Priority',
-                    'filter_query': '{Priority} eq "High"'
-                },
-                'backgroundColor': 'rgba(220, 38, 38, 0.1)',
-                'color': COLORS['danger']
-            },
-            {
-                'if': {
-                    'column_id': 'Priority',
-                    'filter_query': '{Priority} eq "Medium"'
-                },
-                'backgroundColor': 'rgba(217, 119, 6, 0.1)',
-                'color': COLORS['warning']
-            },
-            {
-                'if': {
-                    'column_id': 'Priority',
-                    'filter_query': '{Priority} eq "Low"'
-                },
-                'backgroundColor': 'rgba(5, 150, 105, 0.1)',
-                'color': COLORS['success']
-            },
-            # Unassigned cases styling
-            {
-                'if': {
-                    'column_id': 'Assignee',
-                    'filter_query': '{Assignee} eq "Unassigned"'
-                },
-                'backgroundColor': 'rgba(239, 68, 68, 0.1)',
-                'color': COLORS['danger']
-            },
-            # Delay threshold styling
-            {
-                'if': {
-                    'column_id': 'Real Delay (hours)',
-                    'filter_query': f'{{Real Delay (hours)}} >= {{Threshold Hours}}'
-                },
-                'backgroundColor': 'rgba(220, 38, 38, 0.1)',
-                'color': COLORS['danger']
-            }
-        ]
-    
-    def create_datatable_style_header(self):
-        """Create header style for the DataTable"""
-        return {
-            'backgroundColor': COLORS['primary'],
-            'color': 'white',
-            'fontWeight': 'bold',
-            'textAlign': 'left',
-            'padding': '12px 15px',
-            'whiteSpace': 'normal',
-            'height': 'auto',
-        }
-    
-    def create_datatable_style_cell(self):
-        """Create cell style for the DataTable"""
-        return {
-            'padding': '12px 15px',
-            'textAlign': 'left',
-            'fontFamily': 'system-ui',
-            'fontSize': '14px',
-            'color': COLORS['text'],
-            'whiteSpace': 'normal',
-            'height': 'auto',
-        }
     def setup_layout(self):
         """Setup the dashboard layout with enhanced UI"""
         self.app.layout = html.Div([
@@ -478,21 +696,11 @@ class DelayedMaidsApp:
                         ]),
                         dbc.CardBody([
                             dbc.Row([
-                                dbc.Col([
-                                    html.Div([
-                                        html.Label(
-                                            task,
-                                            className='text-sm font-medium text-gray-700 mb-1'
-                                        ),
-                                        dbc.Input(
-                                            id={'type': 'threshold-input', 'task': task},
-                                            type='number',
-                                            value=hours,
-                                            min=0,
-                                            className='mb-2'
-                                        )
-                                    ]) for task, hours in self.task_thresholds.items()
-                                ], width=12, className='grid grid-cols-4 gap-4')
+                                dbc.Col(
+                                    self._threshold_inputs,
+                                    width=12,
+                                    className='grid grid-cols-4 gap-4'
+                                )
                             ]),
                             dbc.Button(
                                 "Update Thresholds",
@@ -618,13 +826,15 @@ class DelayedMaidsApp:
                             id='download-table-button',
                             className='bg-blue-500 text-white px-4 py-2 rounded-lg hover:bg-blue-600 transition-colors duration-200 flex items-center'
                             ),
-                            dcc.Download(id='download-table-data-xlsx')
+                            dcc.Download(id='download-table-data-xlsx'),
+                            dcc.Store(id='delayed-records-store'),
+                            dcc.Store(id='delayed-records-version')
                         ], className='flex items-center')
                     ], className='flex justify-between items-center'),
                     dbc.CardBody([
                         dash_table.DataTable(
                             id='delayed-maids-table',
-                            columns=self.create_datatable_columns(),
+                            columns=DATATABLE_COLUMNS,
                             dropdown={
                                 'Assignee': {
                                     'options': [{'label': name, 'value': name} for name in ASSIGNEES]
@@ -637,9 +847,9 @@ class DelayedMaidsApp:
                             filter_action='native',
                             page_size=15,
                             style_table={'overflowX': 'auto'},
-                            style_data_conditional=self.create_datatable_style_conditions(),
-                            style_header=self.create_datatable_style_header(),
-                            style_cell=self.create_datatable_style_cell()
+                            style_data_conditional=DATATABLE_STYLE_CONDITIONS,
+                            style_header=DATATABLE_STYLE_HEADER,
+                            style_cell=DATATABLE_STYLE_CELL
                         )
                     ])
                 ])
@@ -659,9 +869,6 @@ class DelayedMaidsApp:
                 return None
             
             try:
-                # Convert table data to DataFrame
-                df = pd.DataFrame(table_data)
-                
                 # List of columns to exclude
                 columns_to_exclude = [
                     'Number of Pending Tasks',
@@ -672,9 +879,9 @@ class DelayedMaidsApp:
                     'Last Updated'
                 ]
                 
-                # Remove specified columns if they exist in the DataFrame
-                columns_to_keep = [col for col in df.columns if col not in columns_to_exclude]
-                df_filtered = df[columns_to_keep]
+                # Build the DataFrame from the kept columns only (table rows share the same keys)
+                columns_to_keep = [col for col in table_data[0] if col not in columns_to_exclude]
+                df_filtered = pd.DataFrame.from_records(table_data, columns=columns_to_keep)
                 
                 # Format timestamp for filename
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -684,7 +891,8 @@ class DelayedMaidsApp:
                     df_filtered.to_excel,
                     f'delayed_maids_table_export_{timestamp}.xlsx',
                     sheet_name='Delayed Cases',
-                    index=False
+                    index=False,
+                    engine='xlsxwriter'
                 )
             except Exception as e:
                 print(f"Error exporting table data: {e}")
@@ -700,9 +908,30 @@ class DelayedMaidsApp:
                 return not is_open
             return is_open
     
+        # Filter options only depend on the filter selection and the loaded data
+        @self.cache.memoize(timeout=CACHE_TIMEOUT, args_to_ignore=['filtered_df'])
+        def create_filter_options(filtered_df, filters, data_version):
+            """Prepare filter options with counts for every filter column"""
+            counts = {column: self.count_values(filtered_df[column]) for column in FILTER_COLUMNS}
+            return [
+                [
+                    {'label': f"{val} ({count})", 'value': val}
+                    for val, count in sorted(counts[column].items())
+                ]
+                for column in FILTER_COLUMNS
+            ]
+    
+        # Serialized charts likewise only depend on the filter selection and the loaded data
+        @self.cache.memoize(timeout=CACHE_TIMEOUT, args_to_ignore=['filtered_df'])
+        def create_chart_figures(filtered_df, filters, data_version):
+            """Build the summary charts as plotly JSON"""
+            charts = self.create_summary_charts(filtered_df)
+            return [charts[name].to_plotly_json() for name in ('type', 'status', 'task')]
+    
         # Main dashboard update callback
         @self.app.callback(
-            [Output('delayed-maids-table', 'data'),
+            [Output('delayed-records-store', 'data'),
+             Output('delayed-records-version', 'data'),
              Output('type-chart', 'figure'),
              Output('status-chart', 'figure'),
              Output('task-chart', 'figure'),
@@ -722,146 +951,166 @@ class DelayedMaidsApp:
              Input('update-thresholds-button', 'n_clicks')],
             [State('upload-data', 'filename'),
              State({'type': 'threshold-input', 'task': ALL}, 'value'),
-             State({'type': 'threshold-input', 'task': ALL}, 'id')]
+             State({'type': 'threshold-input', 'task': ALL}, 'id'),
+             State('delayed-records-version', 'data')]
         )
         def update_dashboard(contents, task_filter, nat_filter, status_filter, 
-                           type_filter, n_clicks, filename, threshold_values, threshold_ids):
+                           type_filter, n_clicks, filename, threshold_values, threshold_ids,
+                           records_version):
             """Main callback to update the dashboard"""
-            trigger = callback_context.triggered[0] if callback_context.triggered else None
-            triggered_id = trigger['prop_id'] if trigger else None
+            triggered_id = ctx.triggered_id
             
             try:
                 # Update thresholds if button was clicked
-                if triggered_id == 'update-thresholds-button.n_clicks' and threshold_values and threshold_ids:
+                if triggered_id == 'update-thresholds-button' and threshold_values and threshold_ids:
                     for threshold_id, value in zip(threshold_ids, threshold_values):
                         task = threshold_id['task']
                         if value is not None and value > 0:
                             self.task_thresholds[task] = value
+                    self._threshold_series = pd.Series(self.task_thresholds, dtype=np.float64)
                     
                     if not self.current_data.empty:
-                        self.current_data['Threshold Hours'] = self.current_data['Task'].map(self.task_thresholds)
-                        self.current_data['Priority'] = self.current_data.apply(self.calculate_priority, axis=1)
-                        self.current_data['Is Delayed'] = self.current_data.apply(
-                            lambda row: float(row['Real Delay (hours)']) > self.task_thresholds.get(row['Task'], 24)
-                            if pd.notna(row['Real Delay (hours)']) and pd.notna(row['Task'])
-                            else False,
-                            axis=1
-                        )
+                        self.current_data['Threshold Hours'] = self.map_thresholds(self.current_data['Task'])
+                        self.current_data['Priority'] = self.calculate_priority(self.current_data)
+                        self.current_data['Is Delayed'] = self.calculate_delay_status(self.current_data)
+                        self._data_version += 1
     
-                # Process new file upload
-                if contents is not None:
-                    content_type, content_string = contents.split(',')
-                    decoded = base64.b64decode(content_string)
-                    
-                    if filename.lower().endswith('.csv'):
-                        df = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-                    elif filename.lower().endswith(('.xls', '.xlsx')):
-                        df = pd.read_excel(io.BytesIO(decoded))
-                    else:
-                        raise ValueError("Unsupported file format")
-                    
-                    self.current_data = self.process_data(df)
+                # Process new file upload (only when the upload fired and the file changed)
+                if triggered_id == 'upload-data' and contents is not None:
+                    upload_key = self.upload_key(contents, filename)
+                    if upload_key != self._last_upload_key:
+                        df = self.parse_upload(contents, filename, upload_key)
+                        self.current_data = self.process_data(df)
+                        self._last_upload_key = upload_key
+                        self._data_version += 1
     
                 # Return empty state if no data
                 if self.current_data.empty:
-                    return [], {}, {}, {}, '0', '0', '0', [], [], [], [], 'No data loaded'
+                    return [], None, {}, {}, {}, '0', '0', '0', [], [], [], [], 'No data loaded'
     
-                # Get only delayed cases
-                filtered_df = self.current_data[self.current_data['Is Delayed'] == True].copy()
+                # Get only delayed cases (selected once per data version)
+                if self._delayed_cache_version != self._data_version:
+                    self._delayed_cache = self.current_data.loc[self.current_data['Is Delayed'].to_numpy(dtype=bool)]
+                    self._delayed_cache_version = self._data_version
+                filtered_df = self._delayed_cache
                 
-                # Apply filters
-                if task_filter:
-                    filtered_df = filtered_df[filtered_df['Task'].isin(task_filter)]
-                if nat_filter:
-                    filtered_df = filtered_df[filtered_df['Housemaid Nationality'].isin(nat_filter)]
-                if status_filter:
-                    filtered_df = filtered_df[filtered_df['Housemaid Status'].isin(status_filter)]
-                if type_filter:
-                    filtered_df = filtered_df[filtered_df['Housemaid Type'].isin(type_filter)]
+                # The browser filters the table itself, so the delayed records are only
+                # sent when this page does not already hold the current version of them
+                if triggered_id in FILTER_IDS and records_version == self._data_version:
+                    records, records_version = no_update, no_update
+                else:
+                    records, records_version = self.to_records(filtered_df), self._data_version
+                
+                # Apply filters as one combined mask and a single row gather
+                filters = tuple(
+                    tuple(selected or ())
+                    for selected in (task_filter, nat_filter, status_filter, type_filter)
+                )
+                if any(filters):
+                    mask = np.ones(len(filtered_df), dtype=bool)
+                    for column, selected in zip(FILTER_COLUMNS, filters):
+                        if selected:
+                            mask &= filtered_df[column].isin(selected).to_numpy()
+                    filtered_df = filtered_df.loc[mask]
     
-                # Calculate statistics
+                # Calculate statistics by counting mask hits rather than slicing frames
+                delay = filtered_df['Real Delay (hours)'].to_numpy()
+                threshold = filtered_df['Threshold Hours'].to_numpy()
                 total_delayed = len(filtered_df)
-                critical_cases = len(filtered_df[
-                    filtered_df['Real Delay (hours)'] > filtered_df['Threshold Hours'] * 2
-                ])
-                unassigned_cases = len(filtered_df[filtered_df['Assignee'] == 'Unassigned'])
+                critical_cases = int(np.count_nonzero(delay > threshold * 2))
+                unassigned_cases = int(np.count_nonzero((filtered_df['Assignee'] == 'Unassigned').to_numpy()))
     
                 # Create charts
-                charts = self.create_summary_charts(filtered_df)
+                figures = create_chart_figures(filtered_df, filters, self._data_version)
+                
+                # Filter changes only need to ship the new traces, not the full figures
+                if triggered_id in FILTER_IDS and all(figure['data'] for figure in figures):
+                    figures = [self.patch_figure(figure) for figure in figures]
     
                 # Prepare filter options with counts
-                def prepare_filter_options(column):
-                    counts = filtered_df[column].value_counts()
-                    return [
-                        {'label': f"{val} ({counts[val]})", 'value': val}
-                        for val in sorted(counts.index)
-                    ]
+                filter_options = create_filter_options(filtered_df, filters, self._data_version)
     
                 # Update timestamp
                 last_update = f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     
                 return (
-                    filtered_df.to_dict('records'),
-                    charts['type'],
-                    charts['status'],
-                    charts['task'],
+                    records,
+                    records_version,
+                    *figures,
                     str(total_delayed),
                     str(critical_cases),
                     str(unassigned_cases),
-                    prepare_filter_options('Task'),
-                    prepare_filter_options('Housemaid Nationality'),
-                    prepare_filter_options('Housemaid Status'),
-                    prepare_filter_options('Housemaid Type'),
+                    *filter_options,
                     last_update
                 )
     
             except Exception as e:
                 print(f"Error updating dashboard: {e}")
-                return [], {}, {}, {}, '0', '0', '0', [], [], [], [], f'Error: {str(e)}'
+                return [], None, {}, {}, {}, '0', '0', '0', [], [], [], [], f'Error: {str(e)}'
+    
+        # Filter the table in the browser from the stored delayed records
+        self.app.clientside_callback(
+            FILTER_RECORDS_JS,
+            Output('delayed-maids-table', 'data'),
+            [Input('delayed-records-store', 'data'),
+             *[Input(filter_id, 'value') for filter_id in FILTER_IDS]]
+        )
     
         # Callback for table cell updates
         @self.app.callback(
             Output('delayed-maids-table', 'data', allow_duplicate=True),
             [Input('delayed-maids-table', 'data_timestamp')],
             [State('delayed-maids-table', 'data'),
-             State('delayed-maids-table', 'data_previous')],
+             State('delayed-maids-table', 'data_previous'),
+             State('delayed-maids-table', 'derived_viewport_indices')],
             prevent_initial_call=True
         )
-        def update_table_data(timestamp, current_data, previous_data):
+        def update_table_data(timestamp, current_data, previous_data, viewport_indices):
             """Update table when data changes"""
             if not current_data:
                 return []
     
             try:
-                # Find changed rows
-                if previous_data:
+                # Find changed rows. Cell edits and pastes only touch the visible page,
+                # so compare those rows first and fall back to a full comparison when
+                # rows were added or deleted (or the edited row was re-sorted away)
+                changed_rows = []
+                if previous_data and viewport_indices and len(current_data) == len(previous_data):
                     changed_rows = [
-                        i for i, (curr, prev) in enumerate(zip(current_data, previous_data))
-                        if curr != prev
+                        i for i in viewport_indices
+                        if current_data[i] != previous_data[i]
                     ]
-                else:
-                    changed_rows = range(len(current_data))
+                if not changed_rows:
+                    if previous_data:
+                        changed_rows = [
+                            i for i, (curr, prev) in enumerate(zip(current_data, previous_data))
+                            if curr != prev
+                        ]
+                    else:
+                        changed_rows = range(len(current_data))
     
                 # Update changed rows
                 current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                changed_rows = list(changed_rows)
+                
+                # Recompute priority for all changed rows at once; edited values that
+                # are missing or non-numeric become NaN and fall through to 'Low'
+                def changed_values(column):
+                    values = pd.Series([current_data[i].get(column) for i in changed_rows], dtype=object)
+                    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+                
+                delay = changed_values('Real Delay (hours)')
+                threshold = changed_values('Threshold Hours')
+                priorities = np.select(
+                    [delay > threshold * 2, delay > threshold],
+                    ['High', 'Medium'],
+                    default='Low'
+                ).tolist()
                 
-                for idx in changed_rows:
+                for idx, priority in zip(changed_rows, priorities):
                     row = current_data[idx]
                     row['Last Updated'] = current_time
-                    
-                    # Update priority based on current delay
-                    try:
-                        delay = float(row['Real Delay (hours)'])
-                        threshold = float(row['Threshold Hours'])
-                        
-                        if delay > threshold * 2:
-                            row['Priority'] = 'High'
-                        elif delay > threshold:
-                            row['Priority'] = 'Medium'
-                        else:
-                            row['Priority'] = 'Low'
-                    except:
-                        row['Priority'] = 'Low'
+                    row['Priority'] = priority
     
                 return current_data
     
@@ -882,10 +1131,12 @@ class DelayedMaidsApp:
             
             try:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                return dcc.send_data_frame(
-                    self.current_data.to_excel,
-                    f'delayed_maids_export_{timestamp}.xlsx',
-                    sheet_name='Delayed Maids'
+                buffer = io.BytesIO()
+                with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+                    self.current_data.to_excel(writer, sheet_name='Delayed Maids')
+                return dcc.send_bytes(
+                    buffer.getvalue(),
+                    f'delayed_maids_export_{timestamp}.xlsx'
                 )
             except Exception as e:
                 print(f"Error exporting data: {e}")